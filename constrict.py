@@ -2,28 +2,94 @@
 import sys
 import subprocess
 import os
+import shutil
 import argparse
+import bisect
 import datetime
+import glob
+import json
+import multiprocessing
+import tempfile
+import concurrent.futures
 
+# Absolute paths of external programs, resolved once rather than on every run
+FFMPEG = shutil.which('ffmpeg')
+FFPROBE = shutil.which('ffprobe')
 
-def get_duration(file_input):
-    return float(
-        subprocess.check_output([
-            "ffprobe",
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            file_input
-        ])[:-1]
+# Options shared by every ffmpeg command, built once rather than per command
+FFMPEG_PREFIX = (FFMPEG, '-y', '-hide_banner', '-loglevel', 'error')
+
+BYTES_PER_MIB = 1024 * 1024
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache/constrict/')
+
+# Threads given to each ffmpeg process when several encodes run in parallel
+# (i.e. segments of a video, or videos in a batch)
+WORKER_THREADS = 4
+
+"""
+Bitrate-resolution recommendations are taken from:
+https://developers.google.com/media/vp9/settings/vod
+
+Each preset is (bitrate lower bound in Kbps, pixel count, height), sorted by
+ascending bitrate so that the presets can be searched with bisect.
+"""
+BITRATE_RES_PRESETS_30 = (
+    (0, 192 * 144, 144),  # 144p
+    (150, 320 * 240, 240),  # 240p
+    (276, 640 * 360, 360),  # 360p
+    (512, 640 * 480, 480),  # 480p
+    (1024, 1280 * 720, 720),  # 720p
+    (1800, 1920 * 1080, 1080),  # 1080p
+    (6000, 2560 * 1440, 1440),  # 2K
+    (12000, 3840 * 2160, 2160)  # 4K
+)
+BITRATE_RES_PRESETS_60 = (
+    (0, 192 * 144, 144),  # 144p
+    (150, 320 * 240, 240),  # 240p
+    (276, 640 * 360, 360),  # 360p
+    (750, 640 * 480, 480),  # 480p
+    (1800, 1280 * 720, 720),  # 720p
+    (3000, 1920 * 1080, 1080),  # 1080p
+    (9000, 2560 * 1440, 1440),  # 2K
+    (18000, 3840 * 2160, 2160)  # 4K
+)
+BITRATE_THRESHOLDS_30 = tuple(preset[0] for preset in BITRATE_RES_PRESETS_30)
+BITRATE_THRESHOLDS_60 = tuple(preset[0] for preset in BITRATE_RES_PRESETS_60)
+
+
+def probe_all(file_input):
+    """
+    Returns the metadata needed for compression (duration, resolution and
+    framerate) from a single ffprobe call, parsed from its JSON output.
+    """
+
+    cmd = [
+        FFPROBE,
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'format=duration:stream=width,height,r_frame_rate',
+        '-print_format', 'json',
+        file_input
+    ]
+
+    return json.loads(
+        subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
     )
 
 
-def new_file(file_path):
+def parse_framerate(fps_fraction):
+    fps_numerator, fps_denominator = map(int, fps_fraction.split('/'))
+    return round(fps_numerator / fps_denominator)
+
+
+def new_file(file_path, taken_paths=()):
     """
     Returns a unique file path for the file path given. Ensures that no file is
     overwritten, as if the input file path already exists, the file path output
     will be in the form of '{file_root}-{n}{file_ext}' where n incremented with
-    every existing file in the directory.
+    every existing file in the directory. Paths in taken_paths are treated as
+    existing files, for paths that have been picked but not yet written to.
 
     Do not use if you *want* to overwrite something.
     """
@@ -32,7 +98,7 @@ def new_file(file_path):
     root_ext = os.path.splitext(file_path)
 
     counter = 0
-    while os.path.exists(final_path):
+    while os.path.exists(final_path) or final_path in taken_paths:
         counter += 1
         final_path = f'{root_ext[0]}-{counter}{root_ext[1]}'
 
@@ -52,44 +118,19 @@ def get_res_preset(bitrate, source_width, source_height, framerate):
 
     source_pixels = source_width * source_height  # Get pixel count
     bitrate_Kbps = bitrate / 1000  # Convert to kilobits
-    """
-    Bitrate-resolution recommendations are taken from:
-    https://developers.google.com/media/vp9/settings/vod
-    """
-    bitrate_res_map_30 = {
-        12000: (3840, 2160),  # 4K
-        6000: (2560, 1440),  # 2K
-        1800: (1920, 1080),  # 1080p
-        1024: (1280, 720),  # 720p
-        512: (640, 480),  # 480p
-        276: (640, 360),  # 360p
-        150: (320, 240),  # 240p
-        0: (192, 144)  # 144p
-    }
-    bitrate_res_map_60 = {
-        18000: (3840, 2160),  # 4K
-        9000: (2560, 1440),  # 2K
-        3000: (1920, 1080),  # 1080p
-        1800: (1280, 720),  # 720p
-        750: (640, 480),  # 480p
-        276: (640, 360),  # 360p
-        150: (320, 240),  # 240p
-        0: (192, 144)  # 144p
-    }
 
-    bitrate_res_map = (
-        bitrate_res_map_30 if framerate <= 30 else bitrate_res_map_60
-    )
+    if framerate <= 30:
+        presets, thresholds = BITRATE_RES_PRESETS_30, BITRATE_THRESHOLDS_30
+    else:
+        presets, thresholds = BITRATE_RES_PRESETS_60, BITRATE_THRESHOLDS_60
 
-    # print(bitrate_res_map)
+    # Index of the highest preset whose bitrate lower bound is met
+    preset_index = bisect.bisect_right(thresholds, bitrate_Kbps) - 1
 
-    for bitrate_lower_bound, res_preset in bitrate_res_map.items():
-        preset_width, preset_height = res_preset[0], res_preset[1]
-        preset_pixels = preset_width * preset_height
-        if (
-            bitrate_Kbps >= bitrate_lower_bound and
-            source_pixels >= preset_pixels
-        ):
+    for _, preset_pixels, preset_height in reversed(
+        presets[:preset_index + 1]
+    ):
+        if source_pixels >= preset_pixels:
             return preset_height
 
     return -1
@@ -119,10 +160,219 @@ def get_encoding_speed(frame_height, codec, extra_quality):
             sys.exit('Error: unknown codec passed to get_encoding_speed')
 
 
-def get_progress(file_input, ffmpeg_cmd):
-    pv_cmd = subprocess.Popen(['pv', file_input], stdout=subprocess.PIPE)
-    ffmpeg_cmd = subprocess.check_output(ffmpeg_cmd, stdin=pv_cmd.stdout)
-    pv_cmd.wait()
+def get_progress(ffmpeg_cmd, duration_seconds):
+    """
+    Runs an ffmpeg command, printing how far through the input it is (read
+    from ffmpeg's -progress output) as a percentage of duration_seconds, along
+    with an estimate of the time remaining.
+    """
+
+    cmd = [ffmpeg_cmd[0], '-progress', 'pipe:1', '-nostats', *ffmpeg_cmd[1:]]
+    start_time = datetime.datetime.now()
+
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as ffmpeg:
+        for line in ffmpeg.stdout:
+            key, _, value = line.strip().partition('=')
+            if key != 'out_time_us' or not value.isdigit():
+                continue  # e.g. 'N/A' before the first frame is written
+
+            progress = min(1, int(value) / 1000000 / duration_seconds)
+            if progress == 0:
+                continue
+
+            elapsed = datetime.datetime.now() - start_time
+            remaining = elapsed * (1 - progress) / progress
+            print(
+                f'\r {progress:.0%} '
+                f'(ETA {str(remaining).split(".")[0]})  ',
+                end='',
+                flush=True
+            )
+
+    print()
+
+    if ffmpeg.returncode != 0:
+        raise subprocess.CalledProcessError(ffmpeg.returncode, cmd)
+
+
+def get_audio_params(audio_bitrate):
+    """
+    Returns the ffmpeg output options for encoding the audio at the given
+    bitrate. If the bitrate is 0 (i.e. the input has no audio), audio is
+    disabled.
+    """
+
+    if audio_bitrate == 0:
+        return ['-an']
+
+    audio_channels = 1 if audio_bitrate < 12000 else 2
+
+    return [
+        '-c:a', 'libopus',
+        '-b:a', f'{audio_bitrate}',
+        '-ac', f'{audio_channels}',
+    ]
+
+
+def encode_segment(job):
+    """
+    Encodes the video stream of a single segment with two passes. Each
+    segment gets its own pass log file, so that workers running at the same
+    time don't overwrite each other's first pass statistics. The first pass is
+    skipped if the statistics from a previous attempt can be reused.
+    """
+
+    (
+        segment_input,
+        segment_output,
+        video_params,
+        passlogfile,
+        run_first_pass
+    ) = job
+
+    passes = [('2', segment_output)]
+    if run_first_pass:
+        passes.insert(0, ('1', '/dev/null'))
+
+    for pass_number, output in passes:
+        cmd = [
+            *FFMPEG_PREFIX,
+            '-i', segment_input,
+            *video_params,
+            '-pass', pass_number,
+            '-passlogfile', passlogfile,
+            '-an',
+        ]
+
+        if pass_number == '1':
+            cmd.extend(['-f', 'null'])
+
+        cmd.append(output)
+        subprocess.run(cmd, check=True)
+
+    return segment_output
+
+
+def split_into_segments(file_input):
+    """
+    Splits the video stream of the input into segments at keyframes, so that
+    the segments can be encoded concurrently by segment_and_encode(). Returns
+    the directory holding the segments and the paths of the segments, in
+    order. The directory is created in the cache directory rather than /tmp,
+    which is often held in memory.
+    """
+
+    cache_dir = get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    segment_dir = tempfile.mkdtemp(prefix='segments-', dir=cache_dir)
+
+    split_cmd = [
+        *FFMPEG_PREFIX,
+        '-i', file_input,
+        '-map', '0:v:0',
+        '-c', 'copy',
+        '-f', 'segment',
+        '-segment_time', '30',
+        '-reset_timestamps', '1',
+        os.path.join(segment_dir, 'seg_%03d.mkv')
+    ]
+
+    print(' Splitting input into segments...')
+    try:
+        subprocess.run(split_cmd, check=True)
+    except BaseException:
+        shutil.rmtree(segment_dir, ignore_errors=True)
+        raise
+
+    segments = sorted(
+        os.path.join(segment_dir, file_name)
+        for file_name in os.listdir(segment_dir)
+    )
+
+    return (segment_dir, segments)
+
+
+def segment_and_encode(
+    segments,
+    file_input,
+    file_output,
+    video_bitrate,
+    audio_bitrate,
+    width,
+    height,
+    framerate,
+    encoder,
+    preset,
+    passlogfile,
+    run_first_pass,
+):
+    """
+    Encodes segments of the input's video stream (from split_into_segments())
+    concurrently in separate ffmpeg processes, then joins them back together
+    with the (re-encoded) audio of the input. The encoded segments are written
+    next to the source segments, replacing those of any previous attempt.
+
+    ffmpeg's own threading scales poorly past a handful of threads for these
+    encoders, so running several smaller encodes at once makes better use of
+    hosts with many cores.
+    """
+
+    video_params = [
+        '-preset', f'{preset}',
+        '-vf', f'scale={width}:{height}',
+    ]
+
+    if framerate != -1:
+        video_params.extend(['-r', f'{framerate}'])
+
+    video_params.extend([
+        '-c:v', encoder,
+        '-b:v', str(video_bitrate),
+        '-threads', str(WORKER_THREADS),
+    ])
+
+    jobs = []
+    for segment in segments:
+        segment_dir, segment_name = os.path.split(segment)
+        jobs.append((
+            segment,
+            os.path.join(segment_dir, f'enc_{segment_name}'),
+            video_params,
+            f'{passlogfile}-{os.path.splitext(segment_name)[0]}',
+            run_first_pass
+        ))
+
+    max_workers = max(1, os.cpu_count() // WORKER_THREADS)
+    print(f' Transcoding {len(jobs)} segments ({max_workers} at once)...')
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        encoded_segments = list(executor.map(encode_segment, jobs))
+
+    with tempfile.NamedTemporaryFile(
+        'w',
+        prefix='constrict-',
+        suffix='.txt'
+    ) as segment_list:
+        for encoded_segment in encoded_segments:
+            segment_list.write(f"file '{encoded_segment}'\n")
+
+        segment_list.flush()
+
+        concat_cmd = [
+            *FFMPEG_PREFIX,
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', segment_list.name,
+            '-i', file_input,
+            '-map', '0:v',
+            '-map', '1:a:0?',
+            '-c:v', 'copy',
+            *get_audio_params(audio_bitrate),
+            '-movflags', '+faststart',
+            file_output
+        ]
+
+        print(' Joining segments...')
+        subprocess.run(concat_cmd, check=True)
 
 
 def transcode(
@@ -135,7 +385,24 @@ def transcode(
     framerate,
     codec,
     extra_quality,
+    duration_seconds,
+    passlogfile,
+    run_first_pass=True,
+    threads=0,
+    segments=None,
 ):
+    """
+    Transcodes the input with a two-pass encode. The statistics of the first
+    pass are written to passlogfile. If run_first_pass is False, the first
+    pass is skipped and the statistics already in passlogfile are reused,
+    which is only valid if the resolution and framerate haven't changed since
+    they were written.
+
+    -If threads is 0, the number of encoder threads is picked automatically.
+    -If segments (of the input, from split_into_segments()) are given, they
+    are encoded in parallel instead of the input as a whole.
+    """
+
     portrait = height > width
     frame_height = width if portrait else height
 
@@ -149,51 +416,55 @@ def transcode(
         'av1': 'libsvtav1'
     }
 
-    pass1_cmd = [
-        'ffmpeg',
-        '-y',
-        '-hide_banner',
-        '-loglevel', 'error',
-        '-i', 'pipe:0',
-        '-row-mt', '1',
-        '-frame-parallel', '1',
-        '-preset', f'{preset}',
-        # '-deadline', 'good',
-        # '-cpu-used', '4',
-        # '-threads', '24',
-        '-vf', f'scale={width}:{height}',
-    ]
-
-    if framerate != -1:
-        pass1_cmd.extend(['-r', f'{framerate}'])
-
-    pass1_cmd.extend([
-        '-c:v', f'{cv_params[codec]}',
-        '-b:v', str(video_bitrate) + '',
-        '-pass', '1',
-        '-an',
-        '-f', 'null',
-        '/dev/null'
-    ])
-
-    print(" ".join(pass1_cmd))
-    print(' Transcoding... (pass 1/2)')
-    get_progress(file_input, pass1_cmd)
-
-    audio_channels = 1 if audio_bitrate < 12000 else 2
+    if segments:
+        segment_and_encode(
+            segments,
+            file_input,
+            file_output,
+            video_bitrate,
+            audio_bitrate,
+            width,
+            height,
+            framerate,
+            cv_params[codec],
+            preset,
+            passlogfile,
+            run_first_pass,
+        )
+        return
+
+    if run_first_pass:
+        pass1_cmd = [
+            *FFMPEG_PREFIX,
+            '-i', file_input,
+            '-preset', f'{preset}',
+            '-vf', f'scale={width}:{height}',
+        ]
+
+        if framerate != -1:
+            pass1_cmd.extend(['-r', f'{framerate}'])
+
+        pass1_cmd.extend([
+            '-c:v', f'{cv_params[codec]}',
+            '-threads', str(threads),
+            '-b:v', str(video_bitrate) + '',
+            '-pass', '1',
+            '-passlogfile', passlogfile,
+            '-an',
+            '-f', 'null',
+            '/dev/null'
+        ])
+
+        print(" ".join(pass1_cmd))
+        print(' Transcoding... (pass 1/2)')
+        get_progress(pass1_cmd, duration_seconds)
+    else:
+        print(' Reusing statistics from previous first pass')
 
     pass2_cmd = [
-        'ffmpeg',
-        '-y',
-        '-hide_banner',
-        '-loglevel', 'error',
-        '-i', 'pipe:0',
-        '-row-mt', '1',
-        '-frame-parallel', '1',
+        *FFMPEG_PREFIX,
+        '-i', file_input,
         '-preset', f'{preset}',
-        # '-threads', '24',
-        # '-deadline', 'good',
-        # '-cpu-used', cpuUsed,
         '-vf', f'scale={width}:{height}',
     ]
 
@@ -202,112 +473,153 @@ def transcode(
 
     pass2_cmd.extend([
         '-c:v', f'{cv_params[codec]}',
+        '-threads', str(threads),
         '-b:v', str(video_bitrate) + '',
         '-pass', '2',
+        '-passlogfile', passlogfile,
         # '-x265-params', 'pass=1',
-        '-c:a', 'libopus',
-        '-b:a', f'{audio_bitrate}',
-        '-ac', f'{audio_channels}',
+        *get_audio_params(audio_bitrate),
+        '-movflags', '+faststart',
         file_output
     ])
     print(" ".join(pass2_cmd))
     print(' Transcoding... (pass 2/2)')
-    get_progress(file_input, pass2_cmd)
+    get_progress(pass2_cmd, duration_seconds)
 
 
-def get_framerate(file_input):
+def get_rotation(file_input):
     cmd = [
-        'ffprobe',
-        '-v', '0',
-        '-of',
-        'default=noprint_wrappers=1:nokey=1',
+        FFPROBE,
+        '-v', 'error',
         '-select_streams', 'v:0',
-        '-show_entries',
-        'stream=r_frame_rate',
+        '-show_entries', 'stream_side_data=rotation',
+        '-of', 'csv=s=x:p=0',
         file_input
     ]
-    fps_bytes = subprocess.check_output(cmd)
-    fps_fraction = fps_bytes.decode('utf-8')
-    fps_fraction_split = fps_fraction.split('/')
-    fps_numerator = int(fps_fraction_split[0])
-    fps_denominator = int(fps_fraction_split[1])
-    fps_float = round(fps_numerator / fps_denominator)
-    return fps_float
 
+    rotation = subprocess.run(
+        cmd, capture_output=True, text=True, check=True
+    ).stdout
 
-def is_streamable(file_input):
-    cmd = ['head', file_input]
-    file_head = subprocess.check_output(cmd)
+    try:
+        rotation = int(rotation)
+    except ValueError:
+        rotation = 0
 
-    moov_bytes = 'moov'.encode('utf-8')
-    mdat_bytes = 'mdat'.encode('utf-8')
+    return rotation
 
-    #  print(f'moov found: {moov_bytes in file_head}')
-    #  print(f'mdat found: {mdat_bytes in file_head}')
 
-    if moov_bytes not in file_head:
-        return mdat_bytes not in file_head
+def get_audio_bitrate(file_input):
+    """
+    Returns an estimate of the bitrate needed to re-encode the input's audio
+    with Opus, read from the source audio stream's metadata rather than by
+    encoding it. This is the source bitrate, capped at 48Kbps per channel
+    (roughly what libopus uses by default). If the source bitrate is unknown,
+    the per-channel estimate is used.
 
-    # moov is now confirmed to be present
+    -If 0 is returned, then the input has no audio stream.
+    """
 
-    if mdat_bytes not in file_head:
-        return True
+    cmd = [
+        FFPROBE,
+        '-v', 'error',
+        '-select_streams', 'a:0',
+        '-show_entries', 'stream=channels,bit_rate',
+        '-print_format', 'json',
+        file_input
+    ]
 
-    # mdia is now confirmed to be present
+    audio_streams = json.loads(
+        subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    ).get('streams', [])
 
-    moov_index = file_head.index(moov_bytes)
-    mdat_index = file_head.index(mdat_bytes)
+    if not audio_streams:
+        return 0
 
-    # print(moov_index)
-    # print(mdat_index)
+    audio_stream = audio_streams[0]
+    estimated_bitrate = 48000 * audio_stream.get('channels', 2)
+    source_bitrate = audio_stream.get('bit_rate', '')
 
-    # faststart enabled if 'moov' shows up before 'mdia'
-    return moov_index < mdat_index
+    if not source_bitrate.isdigit():  # e.g. 'N/A', or missing
+        return estimated_bitrate
 
+    return min(int(source_bitrate), estimated_bitrate)
 
-def make_streamable(file_input, file_output):
-    cmd = ['qt-faststart', file_input, file_output]
-    subprocess.run(cmd, stdout=subprocess.DEVNULL)
 
+def get_cache_dir():
+    return CACHE_DIR
 
-def get_resolution(file_input):
-    cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-select_streams', 'v:0',
-        '-show_entries', 'stream=width,height',
-        '-of', 'csv=s=x:p=0',
-        file_input
-    ]
 
-    res_bytes = subprocess.check_output(cmd)
-    res = res_bytes.decode('utf-8')
-    res_array = res.split('x')
-    width = int(res_array[0])
-    height = int(res_array[1])
+def clear_cached_file(cached_file):
+    if cached_file is not None and os.path.exists(cached_file):
+        os.remove(cached_file)
 
-    return (width, height)
 
+def create_scaled_input(
+    file_input,
+    width,
+    height,
+    framerate,
+    duration_seconds,
+    threads=0,
+):
+    """
+    Writes a high quality copy of the input to the cache directory, scaled to
+    the given resolution and framerate, and returns its path. Every attempt
+    at this resolution and framerate can then read the smaller copy, rather
+    than scaling the full source again. Each copy gets a unique file name, so
+    runs compressing the same input at the same time can't collide.
+
+    -If framerate is -1, the source framerate is kept.
+    """
+
+    cache_dir = get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    file_descriptor, cached_file = tempfile.mkstemp(
+        prefix='scaled-',
+        suffix='.mkv',
+        dir=cache_dir
+    )
+    os.close(file_descriptor)
+
+    video_filter = f'scale={width}:{height}'
+    if framerate != -1:
+        video_filter += f',fps={framerate}'
 
-def get_rotation(file_input):
     cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-select_streams', 'v:0',
-        '-show_entries', 'stream_side_data=rotation',
-        '-of', 'csv=s=x:p=0',
-        file_input
+        *FFMPEG_PREFIX,
+        '-i', file_input,
+        '-map', '0:v:0',
+        '-map', '0:a:0?',
+        '-vf', video_filter,
+        '-c:v', 'libx264',
+        '-crf', '12',
+        '-preset', 'veryfast',
+        '-threads', str(threads),
+        '-c:a', 'copy',
+        cached_file
     ]
 
-    rotation_bytes = subprocess.check_output(cmd)
-    rotation = rotation_bytes.decode('utf-8')
-
+    print(' Scaling input...')
     try:
-        rotation = int(rotation)
-    except ValueError:
-        rotation = 0
+        get_progress(cmd, duration_seconds)
+    except BaseException:
+        clear_cached_file(cached_file)
+        raise
 
-    return rotation
+    return cached_file
+
+
+def clear_pass_logs(passlogfile):
+    """
+    Removes the first pass statistics (including those of every segment)
+    written under the passlogfile prefix. ffmpeg names every log file
+    '{passlogfile}-...', so the logs of other processes whose prefixes merely
+    start with the same characters (e.g. another pid) are left alone.
+    """
+
+    for log_file in glob.glob(f'{glob.escape(passlogfile)}-*'):
+        os.remove(log_file)
 
 
 def bold(text):
@@ -319,32 +631,14 @@ def display_heading(text):
 
 
 def print_table(data):
-    max_key_len = 0
-    max_value_len = 0
-
-    for row in data:
-        row[0] += ':'
+    keys = [row[0] + ':' for row in data]
+    values = [row[1] for row in data]
 
-        if len(row[0]) > max_key_len:
-            max_key_len
+    max_key_len = max(map(len, keys))
+    max_value_len = max(map(len, values))
 
-        max_key_len = (
-            len(row[0]) if len(row[0]) > max_key_len else max_key_len
-        )
-        max_value_len = (
-            len(row[1]) if len(row[1]) > max_value_len else max_value_len
-        )
-
-    for row in data:
-        spaces_to_add = max_key_len - len(row[0])
-        for i in range(spaces_to_add):
-            row[0] += ' '
-
-        spaces_to_add = max_value_len - len(row[1])
-        for i in range(spaces_to_add):
-            row[1] = ' ' + row[1]
-
-        print(f' {row[0]}  {row[1]}')
+    for key, value in zip(keys, values):
+        print(f' {key:<{max_key_len}}  {value:>{max_value_len}}')
 
 
 """ TODO:
@@ -355,293 +649,444 @@ add overwrite confirmation and argument
 add 'source overwrite' mode: -o value same as input file path
 check for when file size doesnt change
 add more error checking for very low target file sizes
-add support for bulk compression
 force container on any file name
 add 'general compression' mode - no target file size(?)
-reconsider where log and streamable files go (output dir rather than PWD?)
 check for output file directory permissions
 add verbosity options (GUI and quiet)
-don't use streamable temp file with quiet verbosity mode
-add overwrite-safe default file outputs (streamable file and compressed file)
 Add check when video bitrate calculation goes over original bitrate
 change how tolerance works
 inhibit suspend while running
 get rid of all this unused and commented out code
 investigate error messages and performance further
 use some kind of maths magic to reduce number of attempts at low file sizes
-improve bitrate recalculation, change from simple multiplication (!!)
 check calculations for bitrate etc. are correct (i.e. MiB vs MB etc)
 add checkers for codecs
-clean up ffmpeg 2pass logs after compression
 improve text formatting
 check framerate text indicator
 Fix 'Application provided invalid, non monotonically increasing dts to muxer in stream'
 Add speed options (CONSIDER HANDBRAKE PRESETS)
-See about 64K audio? and capping audio based on original audio bitrate...
+See about 64K audio?
 Add preview mode for GUI version
 Lower to 16 FPS instead of 24?
 add 10 bit support?
 Clean up AV1 text output
-revisit qt-faststart (doesn't work on fedora)
 """
 
-arg_parser = argparse.ArgumentParser("constrict")
-arg_parser.add_argument(
-    'file_path',
-    help='Location of the video file to be compressed',
-    type=str
-)
-arg_parser.add_argument(
-    'target_size',
-    help='Desired size of the compressed video in MB',
-    type=int
-)
-arg_parser.add_argument(
-    '-t',
-    dest='tolerance',
-    type=int,
-    help='Tolerance of end file size under target in percent (default 10)'
-)
-arg_parser.add_argument(
-    '-o',
-    dest='output',
-    type=str,
-    help='Destination path of the compressed video file'
-)
-arg_parser.add_argument(
-    '--framerate',
-    dest='framerate_option',
-    choices=['auto', 'prefer-clear', 'prefer-smooth'],
-    default='auto',
-    help=(
-        'The maximum framerate to apply to the output file. NOTE: this option '
-        'has no bearing on source videos at 30 FPS or below, and the output '
-        'will be the same regardless of the option set. Additionally, videos '
-        'compressed to very low bitrates will have their framerate capped to '
-        '24 FPS regardless of the option set.\n\n'
-        'auto: auto-apply a 60 FPS maximum framerate in cases where the '
-        'percieved reduction in image clarity from 30 FPS is negligable.\n\n'
-        'prefer-clear: apply a 30 FPS framerate cap, ensuring higher image '
-        'clarity in fewer frames.\n\n'
-        'prefer-smooth: apply a 60 FPS framerate cap, ensuring smoothness '
-        'at a cost to image clarity and sometimes resolution'
-    )
-)
-arg_parser.add_argument(
-    '--extra-quality',
-    action='store_true',
-    help='Increase image quality at the cost of much longer encoding times'
-)
-arg_parser.add_argument(
-    '--codec',
-    dest='codec',
-    choices=['h264', 'hevc', 'av1'],
-    default='h264',
-    help=(
-        'The codec used to encode the compressed video.\n'
-        'h264: uses the H.264 codec. Compatible with most devices and '
-        'services, but with relatively low compression efficiency.\n'
-        'hevc: uses the H.265 (HEVC) codec. Less compatible with devices and '
-        'services, and is slower to encode, but has higher compression '
-        'efficiency.\n'
-        'av1: uses the AV1 codec. High compression efficiency, and is open '
-        'source and royalty free. However, it is less widely supported, and '
-        'may not embed properly on some services.'
-    )
-)
-args = arg_parser.parse_args()
 
-start_time = datetime.datetime.now().replace(microsecond=0)
-
-# Tolerance below target
-tolerance = args.tolerance or 10
-# print(f'Tolerance: {tolerance}')
-file_input = args.file_path
-file_output = args.output
-
-if file_output is None:  # i.e., if -o hasn't been passed
-    root_ext = os.path.splitext(file_input)
-    file_output = new_file(f'{root_ext[0]} (compressed).mp4')
-
-target_size_MiB = args.target_size
-target_size_KiB = target_size_MiB * 1024
-target_size_bytes = target_size_KiB * 1024
-target_size_bits = target_size_bytes * 8
-duration_seconds = get_duration(file_input)
-extra_quality = args.extra_quality
-codec = args.codec
+def compress_one(file_input, file_output, args, threads=0):
+    """
+    Compresses a single video file to the target size given in args, writing
+    the result to file_output.
 
-is_input_streamable = is_streamable(file_input)
-streamable_input = 'streamable_input'
+    -If threads is 0, ffmpeg picks the number of threads for each encode (and
+    may encode segments in parallel). Otherwise, every encode is limited to
+    that many threads, for when several files are compressed at once.
+    """
 
-if not is_input_streamable:
-    display_heading('Creating input stream...')
+    display_heading(f'Compressing {file_input}...')
 
-    root_ext = os.path.splitext(file_input)
-    streamable_input = new_file(f'{root_ext[0]}-stream{root_ext[1]}')
+    start_time = datetime.datetime.now().replace(microsecond=0)
 
-    make_streamable(file_input, streamable_input)
-    file_input = streamable_input
+    # Tolerance below target
+    tolerance = args.tolerance or 10
+    # print(f'Tolerance: {tolerance}')
 
-# print(f'Fast start enabled: {is_input_streamable}')
+    target_size_MiB = args.target_size
+    target_size_KiB = target_size_MiB * 1024
+    target_size_bytes = target_size_KiB * 1024
+    target_size_bits = target_size_bytes * 8
+    extra_quality = args.extra_quality
+    codec = args.codec
 
-before_size_bytes = os.stat(file_input).st_size
+    before_size_bytes = os.path.getsize(file_input)
 
-if before_size_bytes <= target_size_bytes:
-    sys.exit("File already meets the target size.")
+    if before_size_bytes <= target_size_bytes:
+        sys.exit("File already meets the target size.")
 
-reduction_factor = target_size_bytes / before_size_bytes
+    metadata = probe_all(file_input)
+    video_stream = metadata['streams'][0]
+    duration_seconds = float(metadata['format']['duration'])
+    source_fps = parse_framerate(video_stream['r_frame_rate'])
+    width, height = video_stream['width'], video_stream['height']
 
-target_total_bitrate = round(target_size_bits / duration_seconds)
-source_fps = get_framerate(file_input)
-width, height = get_resolution(file_input)
-# print(f'Resolution: {width}x{height}')
-portrait = (width < height) ^ (get_rotation(file_input) == -90)  # xor gate
-print(f'width heigher than height: {width < height}')
-print(f'rotation = {get_rotation(file_input)}')
-print(f'rotated = {get_rotation(file_input) == -90}')
-print(f'portrait = {portrait}')
+    target_total_bitrate = round(target_size_bits / duration_seconds)
+    # print(f'Resolution: {width}x{height}')
+    portrait = (width < height) ^ (get_rotation(file_input) == -90)  # xor gate
+    print(f'width heigher than height: {width < height}')
+    print(f'rotation = {get_rotation(file_input)}')
+    print(f'rotated = {get_rotation(file_input) == -90}')
+    print(f'portrait = {portrait}')
 
-factor = 0
-attempt = 0
-while (factor > 1.0 + (tolerance / 100)) or (factor < 1):
-    attempt = attempt + 1
-    target_total_bitrate = round((target_total_bitrate) * (factor or 1))
-    print(f'target total {target_total_bitrate // 1000}Kbps')
+    source_audio_bitrate = get_audio_bitrate(file_input)
 
     '''
-    crush mode tries to save some image clarity by significantly reducing audio
-    quality and introducing a 24 FPS framerate cap. This makes the footage look
-    slightly less blurry at 144p, and can sometimes save it from being
-    downgraded to 144p as a preset resolution due to the boost in video
-    bitrate.
-
-    Why is the threshold 150 + 96 (= 246)? It's the sum of the lowest
-    recommended bitrate for 240p (150Kbps), plus a 'good quality' bitrate for
-    Opus audio (96Kbps). It means that it shouldn't be possible to 'downgrade'
-    the video to 144p without applying crush mode. Additionally, footage can be
-    'saved' from being downgraded to 144p where, for example:
-
-    Total target bitrate = 200Kbps
-    Bitrate less than threshold, therefore apply crush mode.
-    Target audio bitrate set to 6Kbps (rather than 96Kbps) due to crush mode.
-    Therefore, video bitrate is 194Kbps
-    This is *above* 150Kbps, therefore preset resolution is 240p@24
-
-    And if there was no crush mode:
-    Total target bitrate = 200Kbps
-    Target audio bitrate set to 96Kbps
-    Therefore, video bitrate is 104Kbps
-    This is *below* 150Kbps, therefore preset resolution is 144p@?
+    The total bitrate is found with a bracketed search. Every attempt narrows
+    the (low, high) bounds of the bitrate depending on whether the result was
+    over target or under tolerance. The next attempt scales the bitrate by how
+    far the result was from the middle of the tolerance band (as file size is
+    roughly proportional to bitrate), falling back to the midpoint of the
+    bounds if that estimate lands outside them. The search ends as soon as the
+    file size lands within tolerance under target.
     '''
-    crush_mode = (target_total_bitrate / 1000) < 150 + 96
-    target_audio_bitrate = 6000 if crush_mode else 96000
-    target_video_bitrate = target_total_bitrate - target_audio_bitrate
-
-    # To account for metadata and such to prevent overshooting
-    target_video_bitrate = round(target_video_bitrate * 0.99)
-
-    if (target_video_bitrate < 1000):
-        sys.exit("Video bitrate got too low (<1kbps); aborting")
-
-    target_height = height
-    target_width = width
-
-    preset_height = None
-    max_fps = None
-
-    if crush_mode:
-        print('max fps set to 24')
-        max_fps = 24
-    elif args.framerate_option == 'prefer-clear' or source_fps <= 30:
-        print('max fps set to 30')
-        max_fps = 30
-    elif args.framerate_option == 'prefer-smooth':
-        print('max fps set to 60')
-        max_fps = 60
-    elif args.framerate_option == 'auto':
-        print('auto fps mode...')
-        preset_height_30fps = get_res_preset(
-            target_video_bitrate,
-            width,
-            height,
-            30
-        )
-        preset_height_60fps = get_res_preset(
-            target_video_bitrate,
-            width,
-            height,
-            60
-        )
-
-        preset_height = preset_height_30fps
-        heights_match = preset_height_30fps == preset_height_60fps
-        max_fps = 60 if heights_match and preset_height >= 720 else 30
-
-    keep_fps = source_fps <= max_fps  # Don't 'increase' FPS from source
-    target_fps = source_fps if source_fps <= max_fps else max_fps
+    low_bitrate = 0
+    high_bitrate = None  # No upper bound until a result is over target
+    aim_size_bytes = target_size_bytes * (1 - tolerance / 200)
+    attempt = 0
+
+    # The first pass only depends on the resolution and framerate of the
+    # output, so its statistics are reused until either of them changes.
+    passlogfile = os.path.join(
+        tempfile.gettempdir(),
+        f'constrict-{os.getpid()}'
+    )
+    first_pass_params = None
+    scaled_inputs = {}  # Scaled copies of the input by output parameters
+    segment_dirs = {}  # Segment directories and segments by encode input
 
-    if preset_height is None:
-        preset_height = get_res_preset(
-            target_video_bitrate,
-            width,
-            height,
-            target_fps
-        )
+    # Batch workers already run in parallel (and can't start processes of
+    # their own), so only split into segments when threads isn't limited
+    use_segments = threads == 0 and (os.cpu_count() or 1) >= 2 * WORKER_THREADS
 
-    print(f'Target height {preset_height}')
+    # Temporary files are removed even if compression fails or aborts
+    try:
+        while True:
+            attempt = attempt + 1
+            print(f'target total {target_total_bitrate // 1000}Kbps')
+
+            '''
+            crush mode tries to save some image clarity by significantly
+            reducing audio quality and introducing a 24 FPS framerate cap. This
+            makes the footage look slightly less blurry at 144p, and can
+            sometimes save it from being downgraded to 144p as a preset
+            resolution due to the boost in video bitrate.
+
+            Why is the threshold 150 + 96 (= 246)? It's the sum of the lowest
+            recommended bitrate for 240p (150Kbps), plus a 'good quality'
+            bitrate for Opus audio (96Kbps). It means that it shouldn't be
+            possible to 'downgrade' the video to 144p without applying crush
+            mode. Additionally, footage can be 'saved' from being downgraded to
+            144p where, for example:
+
+            Total target bitrate = 200Kbps
+            Bitrate less than threshold, therefore apply crush mode.
+            Target audio bitrate set to 6Kbps (rather than 96Kbps) due to crush
+            mode.
+            Therefore, video bitrate is 194Kbps
+            This is *above* 150Kbps, therefore preset resolution is 240p@24
+
+            And if there was no crush mode:
+            Total target bitrate = 200Kbps
+            Target audio bitrate set to 96Kbps
+            Therefore, video bitrate is 104Kbps
+            This is *below* 150Kbps, therefore preset resolution is 144p@?
+            '''
+            crush_mode = (target_total_bitrate / 1000) < 150 + 96
+            target_audio_bitrate = min(
+                6000 if crush_mode else 96000,
+                source_audio_bitrate  # Don't 'increase' audio bitrate
+            )
+            target_video_bitrate = target_total_bitrate - target_audio_bitrate
+
+            # To account for metadata and such to prevent overshooting
+            target_video_bitrate = round(target_video_bitrate * 0.99)
+
+            if (target_video_bitrate < 1000):
+                sys.exit("Video bitrate got too low (<1kbps); aborting")
+
+            target_height = height
+            target_width = width
+
+            preset_height = None
+            max_fps = None
+
+            if crush_mode:
+                print('max fps set to 24')
+                max_fps = 24
+            elif args.framerate_option == 'prefer-clear' or source_fps <= 30:
+                print('max fps set to 30')
+                max_fps = 30
+            elif args.framerate_option == 'prefer-smooth':
+                print('max fps set to 60')
+                max_fps = 60
+            elif args.framerate_option == 'auto':
+                print('auto fps mode...')
+                preset_height_30fps = get_res_preset(
+                    target_video_bitrate,
+                    width,
+                    height,
+                    30
+                )
+                preset_height_60fps = get_res_preset(
+                    target_video_bitrate,
+                    width,
+                    height,
+                    60
+                )
+
+                preset_height = preset_height_30fps
+                heights_match = preset_height_30fps == preset_height_60fps
+                max_fps = 60 if heights_match and preset_height >= 720 else 30
+
+            # Don't 'increase' FPS from source
+            keep_fps = source_fps <= max_fps
+            target_fps = source_fps if source_fps <= max_fps else max_fps
+
+            if preset_height is None:
+                preset_height = get_res_preset(
+                    target_video_bitrate,
+                    width,
+                    height,
+                    target_fps
+                )
+
+            print(f'Target height {preset_height}')
+
+            if preset_height != -1:  # If being downscaled:
+                target_height = preset_height
+                scaling_factor = height / target_height
+                target_width = int(((width / scaling_factor + 1) // 2) * 2)
+
+                if portrait:
+                    # Swap height and width
+                    target_width, target_height = target_height, target_width
+
+            displayed_res = target_width if portrait else target_height
+
+            print()
+            display_heading((
+                f'(Attempt {attempt}) '
+                f'compressing to {target_video_bitrate // 1000}Kbps / '
+                f'{displayed_res}p@{target_fps}...'
+            ))
+
+            output_framerate = -1 if keep_fps else target_fps
+            output_params = (target_width, target_height, output_framerate)
+            run_first_pass = first_pass_params != output_params
+            first_pass_params = output_params
+
+            if (target_width, target_height) == (width, height) and keep_fps:
+                encode_input = file_input  # Nothing to scale
+            else:
+                if output_params not in scaled_inputs:
+                    scaled_inputs[output_params] = create_scaled_input(
+                        file_input,
+                        target_width,
+                        target_height,
+                        output_framerate,
+                        duration_seconds,
+                        threads
+                    )
+
+                encode_input = scaled_inputs[output_params]
+
+            segments = None
+            if use_segments:
+                if encode_input not in segment_dirs:
+                    segment_dirs[encode_input] = split_into_segments(
+                        encode_input
+                    )
+
+                segments = segment_dirs[encode_input][1]
+
+            transcode(
+                encode_input,
+                file_output,
+                target_video_bitrate,
+                target_audio_bitrate,
+                target_width,
+                target_height,
+                -1,  # Scaled copies already have the output framerate
+                codec,
+                extra_quality,
+                duration_seconds,
+                passlogfile,
+                run_first_pass,
+                threads,
+                segments,
+            )
+            after_size_bytes = os.path.getsize(file_output)
+            percent_of_target = 100 * after_size_bytes / target_size_bytes
+
+            print()
+            print_table([
+                ['New Size', f'{after_size_bytes / BYTES_PER_MIB:.2f}MB'],
+                ['Percentage of Target', f'{percent_of_target:.0f}%']
+            ])
+
+            if after_size_bytes > target_size_bytes:
+                high_bitrate = target_total_bitrate
+            elif percent_of_target < 100 - tolerance:
+                low_bitrate = target_total_bitrate
+            else:
+                break  # File size is within tolerance
 
-    if preset_height != -1:  # If being downscaled:
-        target_height = preset_height
-        scaling_factor = height / target_height
-        target_width = int(((width / scaling_factor + 1) // 2) * 2)
+            if high_bitrate is not None and high_bitrate - low_bitrate < 1000:
+                sys.exit(
+                    "Bitrate search couldn't reach the target size; aborting"
+                )
 
-        if portrait:
-            # Swap height and width
-            buffer = target_width
-            target_width = target_height
-            target_height = buffer
+            estimated_bitrate = round(
+                target_total_bitrate * aim_size_bytes / after_size_bytes
+            )
 
-    displayed_res = target_width if portrait else target_height
+            within_bounds = (
+                high_bitrate is None or
+                low_bitrate < estimated_bitrate < high_bitrate
+            )
 
-    print()
-    display_heading((
-        f'(Attempt {attempt}) '
-        f'compressing to {target_video_bitrate // 1000}Kbps / '
-        f'{displayed_res}p@{target_fps}...'
-    ))
-
-    transcode(
-        file_input,
-        file_output,
-        target_video_bitrate,
-        target_audio_bitrate,
-        target_width,
-        target_height,
-        -1 if keep_fps else target_fps,
-        codec,
-        extra_quality,
-    )
-    after_size_bytes = os.stat(file_output).st_size
-    percent_of_target = (100 / target_size_bytes) * after_size_bytes
+            if within_bounds:
+                target_total_bitrate = estimated_bitrate
+            else:
+                target_total_bitrate = (low_bitrate + high_bitrate) // 2
+    finally:
+        clear_pass_logs(passlogfile)
+        for scaled_input in scaled_inputs.values():
+            clear_cached_file(scaled_input)
+        for segment_dir, _ in segment_dirs.values():
+            shutil.rmtree(segment_dir, ignore_errors=True)
 
-    factor = 100 / percent_of_target
+    time_taken = datetime.datetime.now().replace(microsecond=0) - start_time
+    print(f"\nCompleted in {time_taken}.")
 
-    if (percent_of_target > 100):
-        # Prevent a lot of attempts resulting in above-target sizes
-        factor -= 0.05
-        #  print(f'Reducing factor by 5%')
 
-    print()
-    print_table([
-        ['New Size', f"{'{:.2f}'.format(after_size_bytes/1024/1024)}MB"],
-        ['Percentage of Target', f"{'{:.0f}'.format(percent_of_target)}%"]
-    ])
+def compress_batch_item(file_input, file_output, args, threads):
+    """
+    Compresses a file in a batch worker process, returning whether it was
+    compressed successfully. Files that can't be compressed are reported here
+    rather than raised, as sys.exit() would otherwise leave the pool waiting
+    on a result that never arrives, and any other error would hide the
+    failures of the rest of the batch.
+    """
 
-if not is_input_streamable:
-    os.remove(streamable_input)
+    try:
+        compress_one(file_input, file_output, args, threads)
+    except SystemExit as error:
+        print(f'{file_input}: {error}', file=sys.stderr)
+        return False
+    except Exception as error:
+        print(f'{file_input}: {error}', file=sys.stderr)
+        return False
+
+    return True
+
+
+def main():
+    arg_parser = argparse.ArgumentParser("constrict")
+    arg_parser.add_argument(
+        'file_paths',
+        help='Location of the video file(s) to be compressed',
+        metavar='file_path',
+        nargs='+',
+        type=str
+    )
+    arg_parser.add_argument(
+        'target_size',
+        help='Desired size of the compressed video in MB',
+        type=int
+    )
+    arg_parser.add_argument(
+        '-t',
+        dest='tolerance',
+        type=int,
+        help='Tolerance of end file size under target in percent (default 10)'
+    )
+    arg_parser.add_argument(
+        '-o',
+        dest='output',
+        type=str,
+        help='Destination path of the compressed video file'
+    )
+    arg_parser.add_argument(
+        '--framerate',
+        dest='framerate_option',
+        choices=['auto', 'prefer-clear', 'prefer-smooth'],
+        default='auto',
+        help=(
+            'The maximum framerate to apply to the output file. NOTE: this '
+            'option has no bearing on source videos at 30 FPS or below, and '
+            'the output will be the same regardless of the option set. '
+            'Additionally, videos compressed to very low bitrates will have '
+            'their framerate capped to 24 FPS regardless of the option set.'
+            '\n\n'
+            'auto: auto-apply a 60 FPS maximum framerate in cases where the '
+            'percieved reduction in image clarity from 30 FPS is negligable.'
+            '\n\n'
+            'prefer-clear: apply a 30 FPS framerate cap, ensuring higher '
+            'image clarity in fewer frames.\n\n'
+            'prefer-smooth: apply a 60 FPS framerate cap, ensuring smoothness '
+            'at a cost to image clarity and sometimes resolution'
+        )
+    )
+    arg_parser.add_argument(
+        '--extra-quality',
+        action='store_true',
+        help='Increase image quality at the cost of much longer encoding times'
+    )
+    arg_parser.add_argument(
+        '--codec',
+        dest='codec',
+        choices=['h264', 'hevc', 'av1'],
+        default='h264',
+        help=(
+            'The codec used to encode the compressed video.\n'
+            'h264: uses the H.264 codec. Compatible with most devices and '
+            'services, but with relatively low compression efficiency.\n'
+            'hevc: uses the H.265 (HEVC) codec. Less compatible with devices '
+            'and services, and is slower to encode, but has higher '
+            'compression efficiency.\n'
+            'av1: uses the AV1 codec. High compression efficiency, and is '
+            'open source and royalty free. However, it is less widely '
+            'supported, and may not embed properly on some services.'
+        )
+    )
+    args = arg_parser.parse_args()
+    file_paths = args.file_paths
+
+    if args.output is not None and len(file_paths) > 1:
+        arg_parser.error('-o can only be used with a single video file')
+
+    if FFMPEG is None:
+        sys.exit('Error: ffmpeg not found')
+    if FFPROBE is None:
+        sys.exit('Error: ffprobe not found')
+
+    # Output paths are picked up front so that files compressed at the same
+    # time can't be given the same default output path
+    file_outputs = []
+    for file_input in file_paths:
+        file_output = args.output
+
+        if file_output is None:  # i.e., if -o hasn't been passed
+            root_ext = os.path.splitext(file_input)
+            file_output = new_file(
+                f'{root_ext[0]} (compressed).mp4',
+                file_outputs
+            )
+
+        file_outputs.append(file_output)
+
+    if len(file_paths) == 1:
+        compress_one(file_paths[0], file_outputs[0], args)
+        return
+
+    # Several smaller encodes at once scale better than one encode with many
+    # threads, so each file gets a few threads and its own worker process
+    processes = max(1, (os.cpu_count() or 1) // WORKER_THREADS)
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.starmap(
+            compress_batch_item,
+            [
+                (file_input, file_output, args, WORKER_THREADS)
+                for file_input, file_output in zip(file_paths, file_outputs)
+            ]
+        )
 
-time_taken = datetime.datetime.now().replace(microsecond=0) - start_time
-print(f"\nCompleted in {time_taken}.")
+    failed_count = results.count(False)
+    if failed_count:
+        sys.exit(
+            f'{failed_count} of {len(file_paths)} files failed to compress'
+        )
 
 
+if __name__ == '__main__':
+    main()